@@ -14,42 +14,96 @@ Track: Agents for Good (Healthcare)
 """
 
 import os
-import json
+import asyncio
+import atexit
+import copy
+import hashlib
 import logging
-from datetime import datetime
-from typing import Dict, List, Any
+import logging.handlers
+import queue
+import random
+import sys
+import threading
+import time
+import uuid
+import weakref
+from functools import lru_cache, partial
+from collections import Counter, OrderedDict
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import Dict, List, Any, Optional, AsyncIterator, Awaitable, Callable, Literal, Tuple
+import diskcache
+import msgspec
+import orjson
 import google.generativeai as genai
+from google.api_core import exceptions as google_exceptions
 
-# Configure logging for observability (Day 4)
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-)
+# Configure logging for observability (Day 4). The calling thread only merges
+# msg % args and enqueues the record; a background listener does the rest of
+# the formatting (timestamp, traceback) and the stderr I/O.
+# Like basicConfig, this leaves an already-configured root logger alone.
+class _DeferredFormatQueueHandler(logging.handlers.QueueHandler):
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # The stdlib prepare() runs the full formatter here, on the caller.
+        # Merge args now so later mutation of them cannot change the message.
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        return record
+
+_root_logger = logging.getLogger()
+if not _root_logger.handlers:
+    _log_queue: "queue.Queue[logging.LogRecord]" = queue.Queue(-1)
+    _stream_handler = logging.StreamHandler()
+    _stream_handler.setFormatter(logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s'))
+    _log_listener = logging.handlers.QueueListener(_log_queue, _stream_handler)
+    _log_listener.start()
+    atexit.register(_log_listener.stop)  # flush queued records on exit
+    _root_logger.addHandler(_DeferredFormatQueueHandler(_log_queue))
+    _root_logger.setLevel(logging.INFO)
 logger = logging.getLogger(__name__)
 
 # Configure Gemini API
 API_KEY = os.getenv('GEMINI_API_KEY', 'YOUR_API_KEY_HERE')
 genai.configure(api_key=API_KEY)
 
-class HealthMonitoringAgent:
-    """Agent 1: Monitors user health metrics and detects anomalies"""
-    
-    def __init__(self):
-        self.name = "HealthMonitor"
-        self.model = genai.GenerativeModel('gemini-pro')
-        logger.info(f"{self.name} initialized")
-    
-    def analyze_health_data(self, user_data: Dict[str, Any]) -> Dict[str, Any]:
-        """Analyze health metrics and detect potential issues"""
-        logger.info(f"{self.name}: Analyzing health data")
-        
-        prompt = f"""
+# Cap on in-flight Gemini requests, and retry policy for rate limiting / overload
+GEMINI_MAX_CONCURRENCY = int(os.getenv('GEMINI_MAX_CONCURRENCY', '8'))
+GEMINI_MAX_RETRIES = 4
+RETRYABLE_ERRORS = (google_exceptions.ResourceExhausted, google_exceptions.ServiceUnavailable)
+# The SDK's own retry (up to 600s on 503) is disabled so stream_text's loop
+# is the only retry policy; each attempt gets its own deadline
+GEMINI_TIMEOUT = float(os.getenv('GEMINI_TIMEOUT', '60'))  # seconds
+GEMINI_REQUEST_OPTIONS = {'retry': None, 'timeout': GEMINI_TIMEOUT}
+
+# Shared on-disk response cache of (health-related) prompts and answers; off
+# unless TECHHEALTH_CACHE_DIR names a directory to keep it in
+RESPONSE_CACHE_DIR = os.getenv('TECHHEALTH_CACHE_DIR', '')
+RESPONSE_CACHE_TTL = 24 * 60 * 60  # seconds
+
+# How long a finished background health check stays available to poll or await
+FUTURE_RESULT_TTL = 60 * 60  # seconds
+
+# Result status values, interned so the many stored copies share one string
+STATUS_SUCCESS = sys.intern('success')
+STATUS_ERROR = sys.intern('error')
+
+# Structured output (response_schema) needs a Gemini 1.5+ model
+GEMINI_MODEL = os.getenv('GEMINI_MODEL', 'gemini-1.5-flash')
+
+@lru_cache(maxsize=None)
+def get_model(model_name: str = GEMINI_MODEL) -> genai.GenerativeModel:
+    """Shared model instance per model name, reused by every agent"""
+    return genai.GenerativeModel(model_name)
+
+# Prompt scaffolds, built once; only the placeholders are filled per call
+HEALTH_PROMPT_TEMPLATE = """
         As a health monitoring AI, analyze the following health metrics:
         
-        Heart Rate: {user_data.get('heart_rate', 'N/A')} bpm
-        Blood Pressure: {user_data.get('blood_pressure', 'N/A')}
-        Sleep Hours: {user_data.get('sleep_hours', 'N/A')}
-        Activity Level: {user_data.get('activity_level', 'N/A')}
+        Heart Rate: {heart_rate} bpm
+        Blood Pressure: {blood_pressure}
+        Sleep Hours: {sleep_hours}
+        Activity Level: {activity_level}
         
         Provide:
         1. Risk level (Low/Medium/High)
@@ -58,43 +112,20 @@ class HealthMonitoringAgent:
         
         Respond in JSON format.
         """
-        
-        try:
-            response = self.model.generate_content(prompt)
-            result = {
-                'agent': self.name,
-                'timestamp': datetime.now().isoformat(),
-                'analysis': response.text,
-                'status': 'success'
-            }
-            logger.info(f"{self.name}: Analysis complete")
-            return result
-        except Exception as e:
-            logger.error(f"{self.name}: Error - {str(e)}")
-            return {'agent': self.name, 'status': 'error', 'error': str(e)}
 
-class RecommendationAgent:
-    """Agent 2: Provides personalized wellness recommendations"""
-    
-    def __init__(self):
-        self.name = "RecommendationEngine"
-        self.model = genai.GenerativeModel('gemini-pro')
-        logger.info(f"{self.name} initialized")
-    
-    def generate_recommendations(self, user_profile: Dict[str, Any], health_analysis: Dict[str, Any]) -> Dict[str, Any]:
-        """Generate personalized health recommendations"""
-        logger.info(f"{self.name}: Generating recommendations")
-        
-        prompt = f"""
+PROFILE_PROMPT_TEMPLATE = """\
+        - Age: {age}
+        - Fitness Goal: {fitness_goal}
+        - Dietary Preferences: {dietary_preferences}"""
+
+RECOMMENDATION_PROMPT_TEMPLATE = """
         Based on the user profile and health analysis, provide personalized recommendations:
         
         User Profile:
-        - Age: {user_profile.get('age', 'N/A')}
-        - Fitness Goal: {user_profile.get('fitness_goal', 'N/A')}
-        - Dietary Preferences: {user_profile.get('dietary_preferences', 'N/A')}
+{profile}
         
         Health Analysis:
-        {health_analysis.get('analysis', 'No analysis available')}
+        {analysis}
         
         Provide:
         1. 3 actionable nutrition tips
@@ -103,34 +134,19 @@ class RecommendationAgent:
         
         Make recommendations specific and achievable.
         """
-        
-        try:
-            response = self.model.generate_content(prompt)
-            result = {
-                'agent': self.name,
-                'timestamp': datetime.now().isoformat(),
-                'recommendations': response.text,
-                'status': 'success'
-            }
-            logger.info(f"{self.name}: Recommendations generated")
-            return result
-        except Exception as e:
-            logger.error(f"{self.name}: Error - {str(e)}")
-            return {'agent': self.name, 'status': 'error', 'error': str(e)}
 
-class MedicalKnowledgeAgent:
-    """Agent 3: Answers medical questions using Gemini's knowledge"""
-    
-    def __init__(self):
-        self.name = "MedicalQA"
-        self.model = genai.GenerativeModel('gemini-pro')
-        logger.info(f"{self.name} initialized")
-    
-    def answer_question(self, question: str) -> Dict[str, Any]:
-        """Answer health-related questions"""
-        logger.info(f"{self.name}: Processing question")
+COMBINED_PROMPT_TEMPLATE = """
+        Complete both tasks below and return a single JSON object with the keys
+        'analysis' and 'recommendations'.
+        
+        analysis:
+        {health_prompt}
         
-        prompt = f"""
+        recommendations:
+        {recommendation_prompt}
+        """
+
+QA_PROMPT_TEMPLATE = """
         As a medical information assistant, answer this health question accurately:
         
         Question: {question}
@@ -142,114 +158,843 @@ class MedicalKnowledgeAgent:
         
         Note: Always emphasize this is informational and not a substitute for professional medical advice.
         """
+
+def format_timestamp(timestamp_ns: int) -> str:
+    """ISO-8601 (UTC) rendering of an epoch-nanosecond timestamp"""
+    return datetime.fromtimestamp(timestamp_ns / 1e9, tz=timezone.utc).isoformat()
+
+def render_timestamps(interaction: Dict[str, Any]) -> Dict[str, Any]:
+    """Copy of a stored interaction with its 'timestamp_ns', and its workflow
+    steps', replaced by an ISO 'timestamp'"""
+    rendered = {}
+    for key, value in interaction.items():
+        if key == 'timestamp_ns':
+            rendered['timestamp'] = format_timestamp(value)
+        elif key == 'steps':
+            rendered['steps'] = [render_timestamps(step) for step in value]
+        else:
+            rendered[key] = value
+    return rendered
+
+class _Default(dict):
+    """format_map mapping that renders missing fields as 'N/A'"""
+    def __missing__(self, key):
+        return 'N/A'
+
+# asyncio primitives belong to a single event loop, so keep one semaphore per loop
+_gemini_semaphores: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, asyncio.Semaphore]" = weakref.WeakKeyDictionary()
+
+def gemini_semaphore() -> asyncio.Semaphore:
+    """Semaphore bounding concurrent Gemini calls on the running event loop"""
+    loop = asyncio.get_running_loop()
+    semaphore = _gemini_semaphores.get(loop)
+    if semaphore is None:
+        semaphore = _gemini_semaphores[loop] = asyncio.Semaphore(GEMINI_MAX_CONCURRENCY)
+    return semaphore
+
+# Event loop behind every TechHealthSystem's sync API. It is started on first
+# use and never closed, because the shared Gemini client stays bound to it.
+_sync_loop: Optional[asyncio.AbstractEventLoop] = None
+_sync_loop_lock = threading.Lock()
+
+def get_sync_loop() -> asyncio.AbstractEventLoop:
+    """Process-wide event loop running on a daemon thread, started lazily"""
+    global _sync_loop
+    with _sync_loop_lock:
+        if _sync_loop is None:
+            _sync_loop = asyncio.new_event_loop()
+            threading.Thread(target=_sync_loop.run_forever, name='techhealth-loop', daemon=True).start()
+        return _sync_loop
+
+@lru_cache(maxsize=None)
+def get_response_cache() -> Optional[diskcache.Cache]:
+    """Process-wide handle on the disk cache shared by all workers, if enabled"""
+    return diskcache.Cache(RESPONSE_CACHE_DIR) if RESPONSE_CACHE_DIR else None
+
+def response_cache_key(model: genai.GenerativeModel, prompt: str, generation_config: Optional[Dict[str, Any]]) -> str:
+    """SHA256 over everything that shapes the response. User-specific data is
+    part of the prompt itself, so different users never share an entry."""
+    digest = hashlib.sha256(model.model_name.encode('utf-8'))
+    digest.update(orjson.dumps(generation_config, option=orjson.OPT_SORT_KEYS))
+    digest.update(prompt.encode('utf-8'))
+    return digest.hexdigest()
+
+async def stream_text(model: genai.GenerativeModel, prompt: str, generation_config: Optional[Dict[str, Any]] = None) -> AsyncIterator[str]:
+    """Yield response text from Gemini chunk by chunk as it is generated.
+    Responses found in the disk cache are yielded in one piece without a call.
+    Rate-limit (429) and overload (503) errors are retried with exponential
+    backoff, as long as nothing has been yielded yet. Disk cache I/O runs in a
+    worker thread so it never blocks the event loop."""
+    cache = get_response_cache()
+    key = response_cache_key(model, prompt, generation_config) if cache is not None else None
+    if cache is not None:
+        cached = await asyncio.to_thread(cache.get, key)
+        if cached is not None:
+            logger.info("Gemini response served from disk cache")
+            yield cached
+            return
+    
+    for attempt in range(GEMINI_MAX_RETRIES + 1):
+        async with gemini_semaphore():
+            try:
+                response = await model.generate_content_async(
+                    prompt, generation_config=generation_config, stream=True, request_options=GEMINI_REQUEST_OPTIONS
+                )
+                chunks = response.__aiter__()
+                first = await anext(chunks)
+            except StopAsyncIteration:
+                return
+            except RETRYABLE_ERRORS as e:
+                if attempt == GEMINI_MAX_RETRIES:
+                    raise
+                error_name = e.__class__.__name__
+            else:
+                parts = [first.text]
+                yield parts[0]
+                async for chunk in chunks:
+                    parts.append(chunk.text)
+                    yield chunk.text
+                break
+        
+        # Back off outside the semaphore so waiting callers can use the slot
+        delay = min(2 ** attempt, 30) * random.uniform(0.5, 1.0)
+        logger.warning("Gemini call failed (%s), retrying in %.1fs", error_name, delay)
+        await asyncio.sleep(delay)
+    
+    # Only a fully received response is cached
+    if cache is not None:
+        await asyncio.to_thread(cache.set, key, ''.join(parts), expire=RESPONSE_CACHE_TTL)
+
+async def collect_text(chunks: AsyncIterator[str]) -> str:
+    """Accumulate a streamed response into the full text"""
+    return ''.join([chunk async for chunk in chunks])
+
+@dataclass(slots=True, frozen=True)
+class AgentResult:
+    """Outcome of one agent step. Kept slotted and immutable in memory;
+    to_dict() gives the public dict form."""
+    agent: str
+    status: str
+    timestamp_ns: int = field(default_factory=time.time_ns)
+    kind: str = ''  # key the payload is published under: 'analysis', 'recommendations' or 'answer'
+    payload: Any = None
+    question: Optional[str] = None
+    error: Optional[str] = None
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Public dict form, as returned to callers and stored in session memory"""
+        if self.status == STATUS_ERROR:
+            return {'agent': self.agent, 'status': self.status, 'error': self.error}
+        result = {'agent': self.agent, 'timestamp_ns': self.timestamp_ns}
+        if self.question is not None:
+            result['question'] = self.question
+        result[self.kind] = self.payload
+        result['status'] = self.status
+        return result
+
+# Risk classes from the rule-based pre-check
+RISK_LOW, RISK_MEDIUM, RISK_HIGH = 0, 1, 2
+
+NORMAL_ACTIVITY_LEVELS = {'moderate', 'active', 'high', 'very active'}
+
+class HealthAnalysis(msgspec.Struct):
+    """Structured health analysis returned by the monitoring agent"""
+    risk_level: Literal['Low', 'Medium', 'High']
+    concerns: List[str]
+    monitor_freq: str
+
+# JSON mode: Gemini must answer with an object matching HealthAnalysis
+HEALTH_ANALYSIS_CONFIG = {
+    'response_mime_type': 'application/json',
+    'response_schema': {
+        'type': 'object',
+        'properties': {
+            'risk_level': {'type': 'string', 'enum': ['Low', 'Medium', 'High']},
+            'concerns': {'type': 'array', 'items': {'type': 'string'}},
+            'monitor_freq': {'type': 'string'}
+        },
+        'required': ['risk_level', 'concerns', 'monitor_freq']
+    }
+}
+
+def decode_health_analysis(text: str) -> Dict[str, Any]:
+    """Validate Gemini's JSON analysis; raises msgspec.ValidationError/DecodeError on bad output"""
+    return msgspec.to_builtins(msgspec.json.decode(text, type=HealthAnalysis))
+
+class HealthCheck(msgspec.Struct):
+    """Analysis and recommendations produced together in one Gemini call"""
+    analysis: HealthAnalysis
+    recommendations: str
+
+HEALTH_CHECK_CONFIG = {
+    'response_mime_type': 'application/json',
+    'response_schema': {
+        'type': 'object',
+        'properties': {
+            'analysis': HEALTH_ANALYSIS_CONFIG['response_schema'],
+            'recommendations': {'type': 'string'}
+        },
+        'required': ['analysis', 'recommendations']
+    }
+}
+
+LOW_RISK_ANALYSIS = orjson.dumps({
+    'risk_level': 'Low',
+    'concerns': [],
+    'monitor_freq': 'Routine (monthly) check-ins'
+}).decode()
+
+def classify_health_risk(user_data: Dict[str, Any]) -> int:
+    """Cheap rule-based risk class for the reported vitals.
+    Missing or unreadable metrics never count as low risk."""
+    try:
+        heart_rate = float(user_data['heart_rate'])
+        systolic, diastolic = (float(part) for part in str(user_data['blood_pressure']).split('/'))
+        sleep_hours = float(user_data['sleep_hours'])
+        activity = str(user_data['activity_level']).strip().lower()
+    except (KeyError, TypeError, ValueError):
+        return RISK_MEDIUM
+    
+    if not 50 <= heart_rate <= 100 or systolic >= 140 or diastolic >= 90 or not 5 <= sleep_hours <= 10:
+        return RISK_HIGH
+    if (60 <= heart_rate <= 90 and systolic < 120 and diastolic < 80
+            and 7 <= sleep_hours <= 9 and activity in NORMAL_ACTIVITY_LEVELS):
+        return RISK_LOW
+    return RISK_MEDIUM
+
+class HealthMonitoringAgent:
+    """Agent 1: Monitors user health metrics and detects anomalies"""
+    
+    def __init__(self):
+        self.name = sys.intern("HealthMonitor")
+        self.model = get_model()
+        logger.info("%s initialized", self.name)
+    
+    def build_prompt(self, user_data: Dict[str, Any]) -> str:
+        """Prompt asking Gemini to assess the given health metrics"""
+        return HEALTH_PROMPT_TEMPLATE.format_map(_Default(user_data))
+    
+    async def analyze_health_data_stream(self, user_data: Dict[str, Any], risk: Optional[int] = None) -> AsyncIterator[str]:
+        """Stream the health analysis text as Gemini produces it. Pass risk when
+        the caller has already classified user_data."""
+        logger.info("%s: Analyzing health data", self.name)
+        if risk is None:
+            risk = classify_health_risk(user_data)
         
+        # Clearly normal vitals get a canned low-risk analysis without a Gemini call
+        if risk == RISK_LOW:
+            logger.info("%s: Vitals within normal ranges, skipping model call", self.name)
+            yield LOW_RISK_ANALYSIS
+            return
+        
+        async for chunk in stream_text(self.model, self.build_prompt(user_data), HEALTH_ANALYSIS_CONFIG):
+            yield chunk
+    
+    async def analyze_health_data(self, user_data: Dict[str, Any], risk: Optional[int] = None) -> AgentResult:
+        """Analyze health metrics and detect potential issues"""
         try:
-            response = self.model.generate_content(prompt)
-            result = {
-                'agent': self.name,
-                'timestamp': datetime.now().isoformat(),
-                'question': question,
-                'answer': response.text,
-                'status': 'success'
-            }
-            logger.info(f"{self.name}: Question answered")
+            analysis = decode_health_analysis(await collect_text(self.analyze_health_data_stream(user_data, risk)))
+            result = AgentResult(self.name, STATUS_SUCCESS, kind='analysis', payload=analysis)
+            logger.info("%s: Analysis complete", self.name)
+            return result
+        except Exception as e:
+            logger.error("%s: Error - %s", self.name, e)
+            return AgentResult(self.name, STATUS_ERROR, error=str(e))
+
+def format_profile(user_profile: Dict[str, Any]) -> str:
+    """Render the user profile section of the recommendation prompt"""
+    return PROFILE_PROMPT_TEMPLATE.format_map(_Default(user_profile))
+
+class RecommendationAgent:
+    """Agent 2: Provides personalized wellness recommendations"""
+    
+    def __init__(self):
+        self.name = sys.intern("RecommendationEngine")
+        self.model = get_model()
+        logger.info("%s initialized", self.name)
+    
+    def build_prompt(self, user_profile: Dict[str, Any], health_analysis: Dict[str, Any], profile_prompt: Optional[str] = None) -> str:
+        """Prompt asking Gemini for recommendations tailored to the profile.
+        A precomputed profile_prompt (see format_profile) is used as-is."""
+        analysis = health_analysis.get('analysis', 'No analysis available')
+        return RECOMMENDATION_PROMPT_TEMPLATE.format(
+            profile=profile_prompt if profile_prompt is not None else format_profile(user_profile),
+            analysis=analysis if isinstance(analysis, str) else orjson.dumps(analysis).decode()
+        )
+    
+    async def generate_recommendations_stream(self, user_profile: Dict[str, Any], health_analysis: Dict[str, Any], profile_prompt: Optional[str] = None) -> AsyncIterator[str]:
+        """Stream recommendation text as Gemini produces it"""
+        logger.info("%s: Generating recommendations", self.name)
+        async for chunk in stream_text(self.model, self.build_prompt(user_profile, health_analysis, profile_prompt)):
+            yield chunk
+    
+    async def generate_recommendations(self, user_profile: Dict[str, Any], health_analysis: Dict[str, Any], profile_prompt: Optional[str] = None) -> AgentResult:
+        """Generate personalized health recommendations"""
+        try:
+            recommendations = await collect_text(self.generate_recommendations_stream(user_profile, health_analysis, profile_prompt))
+            result = AgentResult(self.name, STATUS_SUCCESS, kind='recommendations', payload=recommendations)
+            logger.info("%s: Recommendations generated", self.name)
+            return result
+        except Exception as e:
+            logger.error("%s: Error - %s", self.name, e)
+            return AgentResult(self.name, STATUS_ERROR, error=str(e))
+
+class MedicalKnowledgeAgent:
+    """Agent 3: Answers medical questions using Gemini's knowledge"""
+    
+    def __init__(self):
+        self.name = sys.intern("MedicalQA")
+        self.model = get_model()
+        self.cache_size = 1024
+        self._answer_cache: "OrderedDict[str, str]" = OrderedDict()  # LRU: question key -> answer
+        self._in_flight: Dict[str, asyncio.Future] = {}  # question key -> answer still being generated
+        logger.info("%s initialized", self.name)
+    
+    @staticmethod
+    def _cache_key(question: str) -> str:
+        """Normalize a question so trivially different phrasings share a cache entry"""
+        normalized = ' '.join(question.lower().split())
+        return hashlib.sha1(normalized.encode('utf-8')).hexdigest()
+    
+    def build_prompt(self, question: str) -> str:
+        """Prompt asking Gemini to answer a health question safely"""
+        return QA_PROMPT_TEMPLATE.format(question=question)
+    
+    async def answer_question_stream(self, question: str) -> AsyncIterator[str]:
+        """Stream the answer text; cached answers, and answers to an identical
+        question already being generated, are yielded in one piece"""
+        logger.info("%s: Processing question", self.name)
+        
+        key = self._cache_key(question)
+        cached = self._answer_cache.get(key)
+        if cached is not None:
+            self._answer_cache.move_to_end(key)
+            logger.info("%s: Answer served from cache", self.name)
+            yield cached
+            return
+        
+        in_flight = self._in_flight.get(key)
+        if in_flight is not None:
+            logger.info("%s: Sharing the in-flight answer to an identical question", self.name)
+            # Shielded so a cancelled waiter does not cancel the shared answer
+            yield await asyncio.shield(in_flight)
+            return
+        
+        in_flight = self._in_flight[key] = asyncio.get_running_loop().create_future()
+        chunks = []
+        try:
+            async for chunk in stream_text(self.model, self.build_prompt(question)):
+                chunks.append(chunk)
+                yield chunk
+            answer = ''.join(chunks)
+            in_flight.set_result(answer)
+        except Exception as e:
+            in_flight.set_exception(e)
+            in_flight.exception()  # waiters re-raise it; nothing to log when there are none
+            raise
+        finally:
+            del self._in_flight[key]
+            if not in_flight.done():
+                in_flight.set_exception(RuntimeError("Answer stream was abandoned"))
+                in_flight.exception()
+        
+        # Only a fully received answer is cached
+        self._answer_cache[key] = answer
+        if len(self._answer_cache) > self.cache_size:
+            self._answer_cache.popitem(last=False)
+    
+    async def answer_question(self, question: str) -> AgentResult:
+        """Answer health-related questions"""
+        try:
+            answer = await collect_text(self.answer_question_stream(question))
+            result = AgentResult(self.name, STATUS_SUCCESS, kind='answer', payload=answer, question=question)
+            logger.info("%s: Question answered", self.name)
             return result
         except Exception as e:
-            logger.error(f"{self.name}: Error - {str(e)}")
-            return {'agent': self.name, 'status': 'error', 'error': str(e)}
+            logger.error("%s: Error - %s", self.name, e)
+            return AgentResult(self.name, STATUS_ERROR, error=str(e))
+
+@dataclass
+class Task:
+    """A single step in a coordinator plan; runs once all deps have results"""
+    id: str
+    fn: Callable[..., Awaitable[Any]]
+    deps: List[str] = field(default_factory=list)
+
+class TaskFetcher:
+    """Executes a task graph LLMCompiler-style: ready tasks go onto a queue
+    consumed by worker coroutines, so independent steps run in parallel"""
+    
+    def __init__(self, tasks: List[Task], max_workers: int = 8):
+        self.tasks = {task.id: task for task in tasks}
+        self.max_workers = max_workers
+        self._check_graph(tasks)
+    
+    def _check_graph(self, tasks: List[Task]):
+        """Reject duplicate ids, unknown dependencies and cycles before anything is scheduled"""
+        if len(self.tasks) != len(tasks):
+            duplicates = sorted(task_id for task_id, count in Counter(task.id for task in tasks).items() if count > 1)
+            raise ValueError(f"Duplicate task ids: {duplicates}")
+        for task in self.tasks.values():
+            missing = [dep for dep in task.deps if dep not in self.tasks]
+            if missing:
+                raise ValueError(f"Task {task.id} depends on unknown tasks: {missing}")
+        resolved = set()
+        pending = dict(self.tasks)
+        while pending:
+            ready = [task_id for task_id, task in pending.items() if all(dep in resolved for dep in task.deps)]
+            if not ready:
+                raise ValueError(f"Task graph has a cycle among: {sorted(pending)}")
+            for task_id in ready:
+                resolved.add(task_id)
+                del pending[task_id]
+    
+    async def run(self) -> Dict[str, Any]:
+        """Run every task and return results keyed by task id"""
+        results: Dict[str, Any] = {}
+        if not self.tasks:
+            return results
+        
+        waiting = dict(self.tasks)
+        ready: asyncio.Queue = asyncio.Queue()
+        num_workers = min(self.max_workers, len(self.tasks))
+        
+        def dispatch_ready():
+            for task_id, task in list(waiting.items()):
+                if all(dep in results for dep in task.deps):
+                    del waiting[task_id]
+                    ready.put_nowait(task)
+        
+        async def worker():
+            while True:
+                task = await ready.get()
+                if task is None:
+                    return
+                results[task.id] = await task.fn(*(results[dep] for dep in task.deps))
+                dispatch_ready()
+                if len(results) == len(self.tasks):
+                    for _ in range(num_workers):
+                        ready.put_nowait(None)
+        
+        dispatch_ready()
+        # The TaskGroup cancels the remaining workers as soon as one task fails
+        try:
+            async with asyncio.TaskGroup() as tg:
+                for _ in range(num_workers):
+                    tg.create_task(worker())
+        except ExceptionGroup as eg:
+            raise eg.exceptions[0]
+        
+        return results
+
+# Interaction fields held in Session's columns rather than in the serialized payload
+SESSION_COLUMN_FIELDS = ('agent', 'timestamp_ns', 'status')
+
+@dataclass(slots=True)
+class Session:
+    """Session memory stored column-wise: one list per field, one entry per interaction.
+    Agent, status and timestamp live only in their columns; payloads hold the rest."""
+    user_id: str
+    created_at_ns: int
+    timestamps: List[int] = field(default_factory=list)  # epoch nanoseconds
+    agents: List[str] = field(default_factory=list)
+    statuses: List[str] = field(default_factory=list)
+    payloads: List[bytes] = field(default_factory=list)  # remaining interaction fields, as JSON
+    profile: Optional[Dict[str, Any]] = None  # fixed at create_session
+    profile_prompt: Optional[str] = None  # format_profile(profile), built once per session
+    
+    def profile_prompt_for(self, user_profile: Dict[str, Any]) -> Optional[str]:
+        """Cached profile prompt fragment, unless the caller passes a different profile.
+        The usual case, the very dict given to create_session, is an identity check."""
+        if self.profile_prompt is not None and (user_profile is self.profile or user_profile == self.profile):
+            return self.profile_prompt
+        return None
+    
+    def append(self, agent: str, status: str, interaction: Dict[str, Any]):
+        """Record one interaction across all columns"""
+        self.timestamps.append(interaction.get('timestamp_ns') or time.time_ns())
+        self.agents.append(sys.intern(agent))
+        self.statuses.append(sys.intern(status))
+        self.payloads.append(orjson.dumps(
+            {key: value for key, value in interaction.items() if key not in SESSION_COLUMN_FIELDS}
+        ))
+    
+    def interactions(self) -> List[Dict[str, Any]]:
+        """Rebuild the interaction dicts from the columns and payloads"""
+        return [
+            {'agent': agent, 'timestamp_ns': timestamp_ns, **orjson.loads(payload), 'status': status}
+            for agent, timestamp_ns, status, payload in zip(self.agents, self.timestamps, self.statuses, self.payloads)
+        ]
 
 class CoordinationAgent:
     """Agent 4: Orchestrates multi-agent communication (A2A Protocol)"""
     
     def __init__(self):
-        self.name = "Coordinator"
+        self.name = sys.intern("Coordinator")
         self.health_monitor = HealthMonitoringAgent()
         self.recommender = RecommendationAgent()
         self.medical_qa = MedicalKnowledgeAgent()
-        self.session_memory = {}  # Day 3: Session management
-        logger.info(f"{self.name} initialized with all sub-agents")
+        self.session_memory: Dict[str, Session] = {}  # Day 3: Session management
+        self._futures: Dict[str, asyncio.Task] = {}  # background workflows by future id
+        self._finished_at: Dict[str, float] = {}  # monotonic completion time by future id
+        logger.info("%s initialized with all sub-agents", self.name)
     
-    def create_session(self, user_id: str) -> str:
+    def create_session(self, user_id: str, user_profile: Optional[Dict[str, Any]] = None) -> str:
         """Create a new user session with memory"""
-        session_id = f"session_{user_id}_{datetime.now().timestamp()}"
-        self.session_memory[session_id] = {
-            'user_id': user_id,
-            'created_at': datetime.now().isoformat(),
-            'interactions': []
-        }
-        logger.info(f"{self.name}: Session {session_id} created")
+        created_at_ns = time.time_ns()
+        session_id = f"session_{user_id}_{created_at_ns}"
+        self.session_memory[session_id] = Session(
+            user_id=user_id,
+            created_at_ns=created_at_ns,
+            profile=user_profile,
+            profile_prompt=format_profile(user_profile) if user_profile is not None else None
+        )
+        logger.info("%s: Session %s created", self.name, session_id)
         return session_id
     
-    def process_health_check(self, session_id: str, user_data: Dict[str, Any], user_profile: Dict[str, Any]) -> Dict[str, Any]:
+    def get_session(self, session_id: str) -> Optional[Session]:
+        """Resolve a session id to its Session, or None if unknown"""
+        return self.session_memory.get(session_id)
+    
+    async def process_health_check(self, session_id: str, user_data: Dict[str, Any], user_profile: Dict[str, Any]) -> Dict[str, Any]:
         """Coordinate complete health check workflow"""
-        logger.info(f"{self.name}: Starting health check workflow")
+        logger.info("%s: Starting health check workflow", self.name)
+        session = self.get_session(session_id)
+        
+        started_ns = time.time_ns()
+        steps: List[AgentResult] = []
+        
+        risk = classify_health_risk(user_data)
+        if risk == RISK_LOW:
+            # The analysis is canned and instant, so only the recommender calls Gemini
+            health_analysis = await self.health_monitor.analyze_health_data(user_data, risk)
+            steps.append(health_analysis)
+            if health_analysis.status == STATUS_SUCCESS:
+                steps.append(
+                    await self.recommender.generate_recommendations(
+                        user_profile, {'analysis': health_analysis.payload}, self._profile_prompt(session, user_profile)
+                    )
+                )
+        else:
+            # Steps 1 & 2 share one Gemini round-trip
+            steps.extend(await self._combined_call(user_data, user_profile, self._profile_prompt(session, user_profile)))
         
         workflow_result = {
             'session_id': session_id,
             'workflow': 'health_check',
-            'timestamp': datetime.now().isoformat(),
-            'steps': []
+            'timestamp_ns': started_ns,
+            'steps': [step.to_dict() for step in steps]
         }
         
-        # Step 1: Health monitoring
-        health_analysis = self.health_monitor.analyze_health_data(user_data)
-        workflow_result['steps'].append(health_analysis)
-        
-        # Step 2: Generate recommendations based on analysis
-        if health_analysis['status'] == 'success':
-            recommendations = self.recommender.generate_recommendations(user_profile, health_analysis)
-            workflow_result['steps'].append(recommendations)
-        
         # Store in session memory
-        if session_id in self.session_memory:
-            self.session_memory[session_id]['interactions'].append(workflow_result)
+        if session is not None:
+            status = STATUS_SUCCESS if all(step.status == STATUS_SUCCESS for step in steps) else STATUS_ERROR
+            session.append(self.name, status, workflow_result)
         
-        logger.info(f"{self.name}: Health check workflow complete")
+        logger.info("%s: Health check workflow complete", self.name)
         return workflow_result
     
-    def handle_question(self, session_id: str, question: str) -> Dict[str, Any]:
+    def submit_health_check(self, session_id: str, user_data: Dict[str, Any], user_profile: Dict[str, Any]) -> str:
+        """Start a health check in the background on the running loop and
+        return a future id to poll or await"""
+        self._evict_futures()
+        future_id = uuid.uuid4().hex
+        task = asyncio.create_task(self.process_health_check(session_id, user_data, user_profile))
+        task.add_done_callback(partial(self._mark_finished, future_id))
+        self._futures[future_id] = task
+        logger.info("%s: Health check %s submitted", self.name, future_id)
+        return future_id
+    
+    def _mark_finished(self, future_id: str, task: asyncio.Task):
+        """Done callback: start the workflow's FUTURE_RESULT_TTL clock"""
+        self._finished_at[future_id] = time.monotonic()
+    
+    def _evict_futures(self):
+        """Drop finished workflows nobody collected within FUTURE_RESULT_TTL"""
+        cutoff = time.monotonic() - FUTURE_RESULT_TTL
+        for future_id in [fid for fid, finished in self._finished_at.items() if finished < cutoff]:
+            task = self._futures.pop(future_id, None)
+            del self._finished_at[future_id]
+            if task is not None and not task.cancelled():
+                task.exception()  # mark retrieved so asyncio does not warn on collection
+            logger.info("%s: Health check %s expired uncollected", self.name, future_id)
+    
+    def future_status(self, future_id: str) -> str:
+        """'pending', 'done', 'failed', 'cancelled' or 'unknown' for a submitted workflow"""
+        task = self._futures.get(future_id)
+        if task is None:
+            return 'unknown'
+        if not task.done():
+            return 'pending'
+        if task.cancelled():
+            return 'cancelled'
+        return 'failed' if task.exception() is not None else 'done'
+    
+    async def await_future(self, future_id: str) -> Dict[str, Any]:
+        """Wait for a submitted workflow and return its result; each id can be
+        collected once. Cancelling the wait leaves the workflow running."""
+        task = self._futures.get(future_id)
+        if task is None:
+            return {'error': 'Future not found'}
+        try:
+            return await asyncio.shield(task)
+        finally:
+            if task.done():
+                self._futures.pop(future_id, None)
+                self._finished_at.pop(future_id, None)
+    
+    async def cancel_futures(self):
+        """Cancel every background workflow still running and forget them all"""
+        tasks = list(self._futures.values())
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._futures.clear()
+        self._finished_at.clear()
+    
+    @staticmethod
+    def _profile_prompt(session: Optional[Session], user_profile: Dict[str, Any]) -> Optional[str]:
+        """Session's precomputed profile fragment when it matches user_profile"""
+        return session.profile_prompt_for(user_profile) if session is not None else None
+    
+    async def _combined_call(self, user_data: Dict[str, Any], user_profile: Dict[str, Any], profile_prompt: Optional[str] = None) -> List[AgentResult]:
+        """Run the monitor and recommender prompts as one Gemini request and
+        split the reply back into per-agent steps"""
+        logger.info("%s: Requesting analysis and recommendations in one call", self.name)
+        
+        prompt = COMBINED_PROMPT_TEMPLATE.format(
+            health_prompt=self.health_monitor.build_prompt(user_data),
+            recommendation_prompt=self.recommender.build_prompt(
+                user_profile, {'analysis': 'Use the analysis you produced above.'}, profile_prompt
+            )
+        )
+        
+        try:
+            text = await collect_text(stream_text(self.health_monitor.model, prompt, HEALTH_CHECK_CONFIG))
+            health_check = msgspec.json.decode(text, type=HealthCheck)
+        except Exception as e:
+            logger.error("%s: Error - %s", self.name, e)
+            return [AgentResult(self.health_monitor.name, STATUS_ERROR, error=str(e))]
+        
+        timestamp_ns = time.time_ns()
+        return [
+            AgentResult(self.health_monitor.name, STATUS_SUCCESS, timestamp_ns,
+                        kind='analysis', payload=msgspec.to_builtins(health_check.analysis)),
+            AgentResult(self.recommender.name, STATUS_SUCCESS, timestamp_ns,
+                        kind='recommendations', payload=health_check.recommendations)
+        ]
+    
+    async def handle_question(self, session_id: str, question: str) -> Dict[str, Any]:
         """Handle medical Q&A through dedicated agent"""
-        logger.info(f"{self.name}: Routing question to Medical QA agent")
+        logger.info("%s: Routing question to Medical QA agent", self.name)
+        session = self.get_session(session_id)
         
-        result = self.medical_qa.answer_question(question)
+        result = await self.medical_qa.answer_question(question)
+        answer = result.to_dict()
         
         # Store in session memory
-        if session_id in self.session_memory:
-            self.session_memory[session_id]['interactions'].append(result)
+        if session is not None:
+            session.append(result.agent, result.status, answer)
         
-        return result
+        return answer
+    
+    async def handle_questions(self, session_id: str, questions: List[str]) -> List[Dict[str, Any]]:
+        """Answer a batch of independent questions in parallel"""
+        logger.info("%s: Planning %d questions for Medical QA agent", self.name, len(questions))
+        session = self.get_session(session_id)
+        
+        # Plan: every question is an independent task with no dependencies
+        plan = [
+            Task(id=f"q{i}", fn=lambda q=question: self.medical_qa.answer_question(q))
+            for i, question in enumerate(questions)
+        ]
+        results = await TaskFetcher(plan).run()
+        answers = [results[task.id].to_dict() for task in plan]
+        
+        # Store in session memory, preserving question order
+        if session is not None:
+            for task, answer in zip(plan, answers):
+                session.append(results[task.id].agent, results[task.id].status, answer)
+        
+        return answers
+    
+    async def stream_health_check(self, session_id: str, user_data: Dict[str, Any], user_profile: Dict[str, Any]) -> AsyncIterator[Tuple[str, str]]:
+        """Stream the health check workflow as (agent name, text chunk) pairs.
+        Unlike process_health_check, Gemini errors propagate to the caller."""
+        logger.info("%s: Starting streamed health check workflow", self.name)
+        session = self.get_session(session_id)
+        
+        workflow_result = {
+            'session_id': session_id,
+            'workflow': 'health_check',
+            'timestamp_ns': time.time_ns(),
+            'steps': []
+        }
+        
+        analysis = []
+        async for chunk in self.health_monitor.analyze_health_data_stream(user_data):
+            analysis.append(chunk)
+            yield self.health_monitor.name, chunk
+        health_analysis = decode_health_analysis(''.join(analysis))
+        workflow_result['steps'].append(AgentResult(
+            self.health_monitor.name, STATUS_SUCCESS, kind='analysis', payload=health_analysis
+        ).to_dict())
+        
+        # The analysis is complete at this point, so the recommender builds on it
+        recommendations = []
+        async for chunk in self.recommender.generate_recommendations_stream(
+            user_profile, {'analysis': health_analysis}, self._profile_prompt(session, user_profile)
+        ):
+            recommendations.append(chunk)
+            yield self.recommender.name, chunk
+        workflow_result['steps'].append(AgentResult(
+            self.recommender.name, STATUS_SUCCESS, kind='recommendations', payload=''.join(recommendations)
+        ).to_dict())
+        
+        if session is not None:
+            session.append(self.name, STATUS_SUCCESS, workflow_result)
+        
+        logger.info("%s: Streamed health check workflow complete", self.name)
+    
+    async def stream_question(self, session_id: str, question: str) -> AsyncIterator[str]:
+        """Stream a medical answer chunk by chunk; errors propagate to the caller"""
+        logger.info("%s: Routing streamed question to Medical QA agent", self.name)
+        session = self.get_session(session_id)
+        
+        chunks = []
+        async for chunk in self.medical_qa.answer_question_stream(question):
+            chunks.append(chunk)
+            yield chunk
+        
+        if session is not None:
+            session.append(self.medical_qa.name, STATUS_SUCCESS, AgentResult(
+                self.medical_qa.name, STATUS_SUCCESS, kind='answer', payload=''.join(chunks), question=question
+            ).to_dict())
     
     def get_session_summary(self, session_id: str) -> Dict[str, Any]:
         """Retrieve session history (Day 3: Memory)"""
-        if session_id in self.session_memory:
-            return self.session_memory[session_id]
+        session = self.get_session(session_id)
+        if session is not None:
+            return {
+                'user_id': session.user_id,
+                'created_at': format_timestamp(session.created_at_ns),
+                # Timestamps are kept as nanoseconds and only rendered here
+                'interactions': [render_timestamps(interaction) for interaction in session.interactions()]
+            }
         return {'error': 'Session not found'}
+    
+    def get_session_summary_json(self, session_id: str) -> bytes:
+        """Session history as JSON bytes, ready to write to a response or file"""
+        return orjson.dumps(self.get_session_summary(session_id))
 
 # Main TechHealth System
 class TechHealthSystem:
-    """Main system orchestrating all agents"""
+    """Main system orchestrating all agents.
+    
+    Use either the sync methods or the *_async ones within a process, not
+    both: the shared Gemini client binds to the first event loop that calls
+    it (the process-wide sync loop, or the caller's loop for *_async)."""
     
     def __init__(self):
         self.coordinator = CoordinationAgent()
         logger.info("TechHealth System initialized")
     
+    def close(self):
+        """Cancel this system's outstanding background health checks. The
+        shared sync loop keeps running for other instances."""
+        if _sync_loop is not None:
+            asyncio.run_coroutine_threadsafe(self.coordinator.cancel_futures(), _sync_loop).result()
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, *exc_info):
+        self.close()
+    
+    def _run(self, coro: Awaitable[Any]) -> Any:
+        """Run a coroutine on the system's loop and wait for it, for the sync API"""
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            return asyncio.run_coroutine_threadsafe(coro, get_sync_loop()).result()
+        coro.close()
+        raise RuntimeError(
+            "TechHealthSystem's sync methods cannot be called from a running event loop "
+            "(e.g. a notebook cell or async app); await the matching *_async method instead"
+        )
+    
     def start_wellness_session(self, user_id: str, user_profile: Dict[str, Any]) -> str:
         """Start a new wellness consultation session"""
-        session_id = self.coordinator.create_session(user_id)
-        logger.info(f"Wellness session started for user {user_id}")
+        session_id = self.coordinator.create_session(user_id, user_profile)
+        logger.info("Wellness session started for user %s", user_id)
         return session_id
     
+    async def perform_health_check_async(self, session_id: str, health_data: Dict[str, Any], user_profile: Dict[str, Any]) -> Dict[str, Any]:
+        """Perform comprehensive health assessment (async)"""
+        return await self.coordinator.process_health_check(session_id, health_data, user_profile)
+    
     def perform_health_check(self, session_id: str, health_data: Dict[str, Any], user_profile: Dict[str, Any]) -> Dict[str, Any]:
         """Perform comprehensive health assessment"""
-        return self.coordinator.process_health_check(session_id, health_data, user_profile)
+        return self._run(self.perform_health_check_async(session_id, health_data, user_profile))
+    
+    async def perform_health_check_stream(self, session_id: str, health_data: Dict[str, Any], user_profile: Dict[str, Any]) -> AsyncIterator[Tuple[str, str]]:
+        """Stream the health assessment as (agent name, text chunk) pairs"""
+        async for agent_name, chunk in self.coordinator.stream_health_check(session_id, health_data, user_profile):
+            yield agent_name, chunk
+    
+    async def submit_health_check_async(self, session_id: str, health_data: Dict[str, Any], user_profile: Dict[str, Any]) -> str:
+        """Start a health assessment in the background and return its future id (async)"""
+        return self.coordinator.submit_health_check(session_id, health_data, user_profile)
+    
+    def submit_health_check(self, session_id: str, health_data: Dict[str, Any], user_profile: Dict[str, Any]) -> str:
+        """Start a health assessment in the background and return its future id.
+        The workflow runs on the sync loop's thread while the caller carries on."""
+        return self._run(self.submit_health_check_async(session_id, health_data, user_profile))
+    
+    async def health_check_status_async(self, future_id: str) -> str:
+        """Poll a submitted health assessment (async)"""
+        return self.coordinator.future_status(future_id)
+    
+    def health_check_status(self, future_id: str) -> str:
+        """Poll a submitted health assessment: 'pending', 'done', 'failed', 'cancelled' or 'unknown'"""
+        return self._run(self.health_check_status_async(future_id))
+    
+    async def await_health_check_async(self, future_id: str) -> Dict[str, Any]:
+        """Wait for a submitted health assessment (async)"""
+        return await self.coordinator.await_future(future_id)
+    
+    def await_health_check(self, future_id: str) -> Dict[str, Any]:
+        """Wait for a submitted health assessment and return its result"""
+        return self._run(self.await_health_check_async(future_id))
+    
+    async def ask_medical_question_async(self, session_id: str, question: str) -> Dict[str, Any]:
+        """Get answer to medical question (async)"""
+        return await self.coordinator.handle_question(session_id, question)
     
     def ask_medical_question(self, session_id: str, question: str) -> Dict[str, Any]:
         """Get answer to medical question"""
-        return self.coordinator.handle_question(session_id, question)
+        return self._run(self.ask_medical_question_async(session_id, question))
+    
+    async def ask_medical_question_stream(self, session_id: str, question: str) -> AsyncIterator[str]:
+        """Stream the answer to a medical question as it is generated"""
+        async for chunk in self.coordinator.stream_question(session_id, question):
+            yield chunk
+    
+    async def ask_medical_questions_async(self, session_id: str, questions: List[str]) -> List[Dict[str, Any]]:
+        """Get answers to several medical questions at once (async)"""
+        return await self.coordinator.handle_questions(session_id, questions)
+    
+    def ask_medical_questions(self, session_id: str, questions: List[str]) -> List[Dict[str, Any]]:
+        """Get answers to several medical questions at once"""
+        return self._run(self.ask_medical_questions_async(session_id, questions))
     
     def get_session_history(self, session_id: str) -> Dict[str, Any]:
         """Retrieve complete session history"""
         return self.coordinator.get_session_summary(session_id)
+    
+    def get_session_history_json(self, session_id: str) -> bytes:
+        """Retrieve complete session history as JSON bytes"""
+        return self.coordinator.get_session_summary_json(session_id)
 
 # Example Usage
 if __name__ == "__main__":
@@ -257,41 +1002,41 @@ if __name__ == "__main__":
     print("Multi-Agent Healthcare Solution Demo\n")
     
     # Initialize system
-    system = TechHealthSystem()
-    
-    # User profile
-    user_profile = {
-        'age': 28,
-        'fitness_goal': 'Weight loss and cardiovascular health',
-        'dietary_preferences': 'Vegetarian'
-    }
-    
-    # Start session
-    session_id = system.start_wellness_session("user_123", user_profile)
-    print(f"Session ID: {session_id}\n")
-    
-    # Health data
-    health_data = {
-        'heart_rate': 82,
-        'blood_pressure': '130/85',
-        'sleep_hours': 6,
-        'activity_level': 'Moderate'
-    }
-    
-    # Perform health check
-    print("Performing health assessment...")
-    health_check = system.perform_health_check(session_id, health_data, user_profile)
-    print(json.dumps(health_check, indent=2))
-    
-    # Ask a medical question
-    print("\nAsking medical question...")
-    question = "What are the benefits of regular cardiovascular exercise?"
-    qa_response = system.ask_medical_question(session_id, question)
-    print(json.dumps(qa_response, indent=2))
-    
-    # Get session summary
-    print("\nRetrieving session history...")
-    history = system.get_session_history(session_id)
-    print(f"Total interactions: {len(history.get('interactions', []))}")
+    with TechHealthSystem() as system:
+        
+        # User profile
+        user_profile = {
+            'age': 28,
+            'fitness_goal': 'Weight loss and cardiovascular health',
+            'dietary_preferences': 'Vegetarian'
+        }
+        
+        # Start session
+        session_id = system.start_wellness_session("user_123", user_profile)
+        print(f"Session ID: {session_id}\n")
+        
+        # Health data
+        health_data = {
+            'heart_rate': 82,
+            'blood_pressure': '130/85',
+            'sleep_hours': 6,
+            'activity_level': 'Moderate'
+        }
+        
+        # Perform health check
+        print("Performing health assessment...")
+        health_check = system.perform_health_check(session_id, health_data, user_profile)
+        print(orjson.dumps(health_check, option=orjson.OPT_INDENT_2).decode())
+        
+        # Ask a medical question
+        print("\nAsking medical question...")
+        question = "What are the benefits of regular cardiovascular exercise?"
+        qa_response = system.ask_medical_question(session_id, question)
+        print(orjson.dumps(qa_response, option=orjson.OPT_INDENT_2).decode())
+        
+        # Get session summary
+        print("\nRetrieving session history...")
+        history = system.get_session_history(session_id)
+        print(f"Total interactions: {len(history.get('interactions', []))}")
     
     print("\nDemo complete! TechHealth system successfully demonstrated multi-agent coordination.")
@@ -0,0 +1,47 @@
+import asyncio
+import os
+import sys
+
+import pytest
+
+# Tests never touch the on-disk response cache; techhealth_agent lives at the repo root
+os.environ['TECHHEALTH_CACHE_DIR'] = ''
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+class FakeResponse:
+    """Streamed Gemini response yielding text in two chunks"""
+    def __init__(self, text):
+        self.chunks = [text[:len(text) // 2], text[len(text) // 2:]]
+    
+    def __aiter__(self):
+        return self._iterate()
+    
+    async def _iterate(self):
+        for text in self.chunks:
+            yield type('Chunk', (), {'text': text})()
+
+class FakeModel:
+    """Stand-in for genai.GenerativeModel: raises the queued errors first,
+    then answers every prompt with reply(prompt)"""
+    def __init__(self, reply=lambda prompt: f"answer: {prompt.strip()[:20]}", errors=()):
+        self.model_name = 'fake-model'
+        self.reply = reply
+        self.errors = list(errors)
+        self.calls = []
+    
+    async def generate_content_async(self, prompt, **kwargs):
+        self.calls.append(prompt)
+        await asyncio.sleep(0)
+        if self.errors:
+            raise self.errors.pop(0)
+        return FakeResponse(self.reply(prompt))
+
+@pytest.fixture
+def fake_model():
+    return FakeModel
+
+@pytest.fixture
+def no_backoff(monkeypatch):
+    """Make stream_text's retry backoff sleep for zero seconds"""
+    import techhealth_agent
+    monkeypatch.setattr(techhealth_agent.random, 'uniform', lambda low, high: 0.0)
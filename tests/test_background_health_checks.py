@@ -0,0 +1,81 @@
+import asyncio
+
+import techhealth_agent
+from techhealth_agent import CoordinationAgent
+
+def test_future_goes_pending_then_done_then_not_found():
+    async def main():
+        coordinator = CoordinationAgent()
+        release = asyncio.Event()
+        
+        async def process_health_check(session_id, user_data, user_profile):
+            await release.wait()
+            return {'workflow': 'health_check', 'session_id': session_id}
+        
+        coordinator.process_health_check = process_health_check
+        future_id = coordinator.submit_health_check('session', {}, {})
+        statuses = [coordinator.future_status(future_id)]
+        release.set()
+        await asyncio.sleep(0)
+        statuses.append(coordinator.future_status(future_id))
+        result = await coordinator.await_future(future_id)
+        return statuses, result, coordinator.future_status(future_id), await coordinator.await_future(future_id)
+    
+    statuses, result, status_after, second_await = asyncio.run(main())
+    assert statuses == ['pending', 'done']
+    assert result == {'workflow': 'health_check', 'session_id': 'session'}
+    assert status_after == 'unknown'
+    assert second_await == {'error': 'Future not found'}
+
+def test_failed_and_cancelled_futures():
+    async def main():
+        coordinator = CoordinationAgent()
+        
+        async def fail(*args):
+            raise RuntimeError('boom')
+        
+        coordinator.process_health_check = fail
+        failed = coordinator.submit_health_check('session', {}, {})
+        coordinator.process_health_check = lambda *args: asyncio.sleep(10)
+        cancelled = coordinator.submit_health_check('session', {}, {})
+        coordinator._futures[cancelled].cancel()
+        await asyncio.sleep(0)
+        await asyncio.sleep(0)
+        return coordinator.future_status(failed), coordinator.future_status(cancelled)
+    
+    assert asyncio.run(main()) == ('failed', 'cancelled')
+
+def test_cancelled_wait_leaves_the_workflow_running():
+    async def main():
+        coordinator = CoordinationAgent()
+        
+        async def process_health_check(*args):
+            await asyncio.sleep(0.02)
+            return {'ok': True}
+        
+        coordinator.process_health_check = process_health_check
+        future_id = coordinator.submit_health_check('session', {}, {})
+        waiter = asyncio.create_task(coordinator.await_future(future_id))
+        await asyncio.sleep(0)
+        waiter.cancel()
+        await asyncio.gather(waiter, return_exceptions=True)
+        return coordinator.future_status(future_id), await coordinator.await_future(future_id)
+    
+    assert asyncio.run(main()) == ('pending', {'ok': True})
+
+def test_uncollected_futures_expire(monkeypatch):
+    monkeypatch.setattr(techhealth_agent, 'FUTURE_RESULT_TTL', 0)
+    
+    async def main():
+        coordinator = CoordinationAgent()
+        
+        async def process_health_check(*args):
+            return {'ok': True}
+        
+        coordinator.process_health_check = process_health_check
+        expired = coordinator.submit_health_check('session', {}, {})
+        await asyncio.sleep(0.01)
+        coordinator.submit_health_check('session', {}, {})  # evicts finished entries past the TTL
+        return coordinator.future_status(expired)
+    
+    assert asyncio.run(main()) == 'unknown'
@@ -0,0 +1,73 @@
+import pytest
+
+from techhealth_agent import RISK_HIGH, RISK_LOW, RISK_MEDIUM, classify_health_risk
+
+NORMAL_VITALS = {
+    'heart_rate': 72,
+    'blood_pressure': '115/75',
+    'sleep_hours': 8,
+    'activity_level': 'Moderate'
+}
+
+def vitals(**overrides):
+    return {**NORMAL_VITALS, **overrides}
+
+def test_normal_vitals_are_low_risk():
+    assert classify_health_risk(NORMAL_VITALS) == RISK_LOW
+
+@pytest.mark.parametrize('blood_pressure, expected', [
+    ('119/79', RISK_LOW),
+    ('120/79', RISK_MEDIUM),
+    ('119/80', RISK_MEDIUM),
+    ('120/80', RISK_MEDIUM),
+    ('139/89', RISK_MEDIUM),
+    ('140/85', RISK_HIGH),
+    ('130/90', RISK_HIGH),
+])
+def test_blood_pressure_boundaries(blood_pressure, expected):
+    assert classify_health_risk(vitals(blood_pressure=blood_pressure)) == expected
+
+@pytest.mark.parametrize('heart_rate, expected', [
+    (49, RISK_HIGH),
+    (50, RISK_MEDIUM),
+    (59, RISK_MEDIUM),
+    (60, RISK_LOW),
+    (90, RISK_LOW),
+    (91, RISK_MEDIUM),
+    (100, RISK_MEDIUM),
+    (101, RISK_HIGH),
+])
+def test_heart_rate_boundaries(heart_rate, expected):
+    assert classify_health_risk(vitals(heart_rate=heart_rate)) == expected
+
+@pytest.mark.parametrize('sleep_hours, expected', [
+    (4.5, RISK_HIGH),
+    (5, RISK_MEDIUM),
+    (6.9, RISK_MEDIUM),
+    (7, RISK_LOW),
+    (9, RISK_LOW),
+    (9.5, RISK_MEDIUM),
+    (10.5, RISK_HIGH),
+])
+def test_sleep_boundaries(sleep_hours, expected):
+    assert classify_health_risk(vitals(sleep_hours=sleep_hours)) == expected
+
+def test_numeric_strings_are_parsed():
+    assert classify_health_risk(vitals(heart_rate='72', sleep_hours='8')) == RISK_LOW
+
+@pytest.mark.parametrize('activity_level', ['Sedentary', 'low', ''])
+def test_low_activity_is_not_low_risk(activity_level):
+    assert classify_health_risk(vitals(activity_level=activity_level)) == RISK_MEDIUM
+
+@pytest.mark.parametrize('blood_pressure', ['high', '120', '120/80/70', 'abc/80', None])
+def test_unreadable_blood_pressure_is_medium(blood_pressure):
+    assert classify_health_risk(vitals(blood_pressure=blood_pressure)) == RISK_MEDIUM
+
+@pytest.mark.parametrize('missing', sorted(NORMAL_VITALS))
+def test_missing_metric_is_medium(missing):
+    user_data = dict(NORMAL_VITALS)
+    del user_data[missing]
+    assert classify_health_risk(user_data) == RISK_MEDIUM
+
+def test_non_numeric_heart_rate_is_medium():
+    assert classify_health_risk(vitals(heart_rate='fast')) == RISK_MEDIUM
@@ -0,0 +1,36 @@
+import asyncio
+
+from google.api_core import exceptions as google_exceptions
+
+from techhealth_agent import STATUS_ERROR, STATUS_SUCCESS, CoordinationAgent
+
+def test_duplicate_questions_in_a_batch_share_one_call(fake_model):
+    coordinator = CoordinationAgent()
+    model = coordinator.medical_qa.model = fake_model(reply=lambda prompt: prompt)  # echo, so answers show their prompt
+    
+    answers = asyncio.run(coordinator.handle_questions('session', ['a', 'b', 'A ']))
+    
+    assert len(model.calls) == 2
+    assert [answer['question'] for answer in answers] == ['a', 'b', 'A ']
+    assert answers[2]['answer'] == answers[0]['answer'] != answers[1]['answer']
+
+def test_cached_answer_skips_the_call(fake_model):
+    coordinator = CoordinationAgent()
+    model = coordinator.medical_qa.model = fake_model()
+    
+    async def main():
+        await coordinator.handle_question('session', 'What is sleep?')
+        return await coordinator.handle_question('session', '  what is SLEEP? ')
+    
+    assert asyncio.run(main())['status'] == STATUS_SUCCESS
+    assert len(model.calls) == 1
+
+def test_failed_in_flight_answer_fails_every_duplicate(fake_model):
+    coordinator = CoordinationAgent()
+    model = coordinator.medical_qa.model = fake_model(errors=[google_exceptions.InvalidArgument('400')])
+    
+    answers = asyncio.run(coordinator.handle_questions('session', ['a', 'a']))
+    
+    assert len(model.calls) == 1
+    assert [answer['status'] for answer in answers] == [STATUS_ERROR, STATUS_ERROR]
+    assert not coordinator.medical_qa._in_flight
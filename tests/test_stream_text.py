@@ -0,0 +1,55 @@
+import asyncio
+
+import pytest
+from google.api_core import exceptions as google_exceptions
+
+import techhealth_agent
+from techhealth_agent import GEMINI_MAX_RETRIES, collect_text, stream_text
+
+def test_streams_the_response(fake_model):
+    model = fake_model(reply=lambda prompt: 'hello world')
+    
+    async def chunks():
+        return [chunk async for chunk in stream_text(model, 'hi')]
+    
+    assert asyncio.run(chunks()) == ['hello', ' world']
+    assert len(model.calls) == 1
+
+def test_retries_then_succeeds(fake_model, no_backoff):
+    model = fake_model(
+        reply=lambda prompt: 'ok',
+        errors=[google_exceptions.ResourceExhausted('429'), google_exceptions.ServiceUnavailable('503')]
+    )
+    assert asyncio.run(collect_text(stream_text(model, 'hi'))) == 'ok'
+    assert len(model.calls) == 3
+
+def test_gives_up_after_max_retries(fake_model, no_backoff):
+    model = fake_model(errors=[google_exceptions.ResourceExhausted('429')] * (GEMINI_MAX_RETRIES + 1))
+    with pytest.raises(google_exceptions.ResourceExhausted):
+        asyncio.run(collect_text(stream_text(model, 'hi')))
+    assert len(model.calls) == GEMINI_MAX_RETRIES + 1
+
+def test_other_errors_are_not_retried(fake_model, no_backoff):
+    model = fake_model(errors=[google_exceptions.InvalidArgument('400')])
+    with pytest.raises(google_exceptions.InvalidArgument):
+        asyncio.run(collect_text(stream_text(model, 'hi')))
+    assert len(model.calls) == 1
+
+def test_backoff_releases_the_semaphore(fake_model, monkeypatch):
+    monkeypatch.setattr(techhealth_agent, 'GEMINI_MAX_CONCURRENCY', 1)
+    monkeypatch.setattr(techhealth_agent.random, 'uniform', lambda low, high: 0.05)
+    backing_off = fake_model(reply=lambda prompt: 'late', errors=[google_exceptions.ResourceExhausted('429')])
+    other = fake_model(reply=lambda prompt: 'early')
+    finished = []
+    
+    async def call(model):
+        finished.append(await collect_text(stream_text(model, 'hi')))
+    
+    async def main():
+        first = asyncio.create_task(call(backing_off))
+        await asyncio.sleep(0.01)  # first call has failed and is sleeping
+        await call(other)
+        await first
+    
+    asyncio.run(main())
+    assert finished == ['early', 'late']
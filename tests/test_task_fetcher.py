@@ -0,0 +1,73 @@
+import asyncio
+
+import pytest
+
+from techhealth_agent import Task, TaskFetcher
+
+def test_runs_tasks_after_their_dependencies():
+    order = []
+    
+    def step(name, value):
+        async def fn(*deps):
+            order.append(name)
+            return value + sum(deps)
+        return fn
+    
+    plan = [
+        Task('total', step('total', 0), deps=['a', 'b']),
+        Task('a', step('a', 1)),
+        Task('b', step('b', 2), deps=['a']),
+    ]
+    results = asyncio.run(TaskFetcher(plan).run())
+    
+    assert results == {'a': 1, 'b': 3, 'total': 4}
+    assert order == ['a', 'b', 'total']
+
+def test_independent_tasks_run_in_parallel():
+    running = []
+    peak = []
+    
+    async def fn():
+        running.append(1)
+        peak.append(len(running))
+        await asyncio.sleep(0.01)
+        running.pop()
+    
+    asyncio.run(TaskFetcher([Task(f"t{i}", fn) for i in range(4)], max_workers=4).run())
+    assert max(peak) == 4
+
+def test_empty_plan():
+    assert asyncio.run(TaskFetcher([]).run()) == {}
+
+async def noop(*deps):
+    return None
+
+def test_rejects_duplicate_ids():
+    with pytest.raises(ValueError, match='Duplicate task ids'):
+        TaskFetcher([Task('a', noop), Task('a', noop)])
+
+def test_rejects_unknown_dependencies():
+    with pytest.raises(ValueError, match='unknown tasks'):
+        TaskFetcher([Task('a', noop, deps=['missing'])])
+
+def test_rejects_cycles():
+    with pytest.raises(ValueError, match='cycle'):
+        TaskFetcher([Task('a', noop, deps=['b']), Task('b', noop, deps=['a']), Task('c', noop)])
+
+def test_failing_task_cancels_the_rest():
+    cancelled = []
+    
+    async def fail():
+        await asyncio.sleep(0)
+        raise RuntimeError('boom')
+    
+    async def slow():
+        try:
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            cancelled.append(True)
+            raise
+    
+    with pytest.raises(RuntimeError, match='boom'):
+        asyncio.run(TaskFetcher([Task('fail', fail), Task('slow', slow), Task('after', noop, deps=['fail'])]).run())
+    assert cancelled == [True]